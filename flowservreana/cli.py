@@ -14,11 +14,12 @@ workflows.
 
 import click
 import os
+import yaml
 
 from flowserv.model.run.base import RunHandle
 from flowserv.model.template.base import WorkflowTemplate
 from flowserv.model.workflow.state import StatePending
-from flowservreana.client import REANAClient
+from flowservreana.client import get_default_client
 from flowservreana.workflow import REANAWorkflow
 
 import flowserv.core.util as util
@@ -42,7 +43,7 @@ def cli():
 def cancel_workflow(workflow):
     """Cancel workflow execution."""
     try:
-        REANAClient().stop_workflow(workflow)
+        get_default_client().stop_workflow(workflow)
         click.echo('workflow stopped')
     except Exception as ex:
         click.echo('Error: {}'.format(ex))
@@ -59,7 +60,7 @@ def cancel_workflow(workflow):
 )
 def run_workflow(spec):
     """Create a new workflow run for the given specification."""
-    doc = util.read_object(filename=spec)
+    doc = read_spec(spec)
     rundir = os.path.dirname(spec)
     if not rundir:
         rundir = '.'
@@ -72,7 +73,7 @@ def run_workflow(spec):
         rundir=rundir
     )
     template = WorkflowTemplate(workflow_spec=doc, sourcedir=rundir)
-    wf = REANAClient().create_workflow(run, template, dict())
+    wf = get_default_client().create_workflow(run, template, dict())
     click.echo('created workflow {} ({})'.format(wf.identifier, wf.state))
 
 
@@ -96,7 +97,7 @@ def run_workflow(spec):
 )
 def download_file(workflow, source, target):
     """Download file from workflow workspace."""
-    REANAClient().download_file(workflow, source, target)
+    get_default_client().download_file(workflow, source, target)
 
 
 # -- Workflow Status ----------------------------------------------------------
@@ -105,12 +106,45 @@ def download_file(workflow, source, target):
 @click.option(
     '-w', '--workflow',
     required=True,
-    help='Workflow identifier.'
+    multiple=True,
+    help='Workflow identifier (can be given multiple times).'
 )
 def get_workflow_state(workflow):
     """Get workflow state."""
     try:
-        state = REANAClient().get_workflow_state(workflow, StatePending())
-        click.echo('in state {}'.format(state))
+        client = get_default_client()
+        if len(workflow) == 1:
+            state = client.get_workflow_state(workflow[0], StatePending())
+            click.echo('in state {}'.format(state))
+        else:
+            # Request the status for all workflows concurrently.
+            states = client.get_workflow_states(
+                {w: StatePending() for w in workflow}
+            )
+            for w in workflow:
+                click.echo('{} in state {}'.format(w, states[w]))
     except Exception as ex:
         click.echo('Error: {}'.format(ex))
+
+
+# -- Helper Methods -----------------------------------------------------------
+
+def read_spec(filename):
+    """Read a workflow specification from file. YAML files are parsed using
+    the libyaml-based loader if PyYAML was built with libyaml. All other files
+    are read using the default flowServ reader.
+
+    Parameters
+    ----------
+    filename: string
+        Path to the workflow specification file.
+
+    Returns
+    -------
+    dict
+    """
+    loader = getattr(yaml, 'CFullLoader', None)
+    if loader is None or filename.endswith('.json'):
+        return util.read_object(filename=filename)
+    with open(filename, 'r') as f:
+        return yaml.load(f, Loader=loader)
@@ -13,23 +13,153 @@ execution, get workflow status, and download workflow result files.
 """
 
 import os
+import posixpath
+import random
+import socket
+import tarfile
+import tempfile
+import threading
+import time
+import uuid
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+from urllib.parse import urljoin
 
 from flowserv.controller.remote.client import RemoteClient
 from flowserv.controller.remote.workflow import RemoteWorkflowHandle
 from flowservreana.workflow import REANAWorkflow
 
-import flowserv.core.util as util
+try:
+    from requests.exceptions import ConnectionError as HTTPConnectionError
+    from requests.exceptions import Timeout as HTTPTimeout
+except ImportError:
+    HTTPConnectionError = ConnectionError
+    HTTPTimeout = TimeoutError
 
 
-"""Definition of possible workflow states. Uses lists since there is a 1:n
+"""Definition of possible workflow states. Uses sets since there is a 1:n
 mapping between the states of workflow benchmarks and REANA workflow states.
 """
-REANA_STATE_PENDING = ['created', 'queued']
-REANA_STATE_RUNNING = ['running']
-REANA_STATE_ERROR = ['failed', 'stopped', 'deleted']
-REANA_STATE_SUCCESS = ['finished']
+REANA_STATE_PENDING = frozenset(['created', 'queued'])
+REANA_STATE_RUNNING = frozenset(['running'])
+REANA_STATE_ERROR = frozenset(['failed', 'stopped', 'deleted'])
+REANA_STATE_SUCCESS = frozenset(['finished'])
+
+REANA_ACTIVE_STATE = REANA_STATE_PENDING | REANA_STATE_RUNNING
+
+# Default number of worker threads that are used for concurrent file uploads.
+DEFAULT_MAX_WORKERS = 16
+
+# Number of attempts and initial delay (in seconds) for retrying idempotent
+# requests to the REANA cluster.
+RETRY_ATTEMPTS = 3
+RETRY_DELAY = 0.25
+# Errors for failed connections and timeouts that are retried. Responses with
+# a server error status code (5xx) are retried as well.
+TRANSIENT_ERRORS = (
+    ConnectionError,
+    TimeoutError,
+    socket.timeout,
+    HTTPConnectionError,
+    HTTPTimeout
+)
+
+# Number of retries for failed connection attempts in the shared HTTP session.
+HTTP_MAX_RETRIES = 3
+
+# Default time (in seconds) for which a workflow status that was received from
+# the REANA cluster is reused. Caching is disabled by default so that every
+# poll of the workflow controller receives the current status.
+DEFAULT_STATUS_TTL = 0
+
+# Name of the archive file that contains all workflow input files if inputs
+# are uploaded as a single archive.
+INPUT_ARCHIVE = '.flowserv-inputs.tar.gz'
+
+# Size of chunks and of the write buffer (in bytes) for streaming file
+# downloads.
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+# Size of the read buffer (in bytes) for files that are uploaded.
+UPLOAD_BUFFER_SIZE = 1024 * 1024
+
+# Default REANA client that is shared by all workflow controllers in the
+# process (see get_default_client).
+_default_client = None
+
+# Shared client for the REANA Server API that is used by the reana-client API
+# module (see default_api_client). The client is stored together with the
+# identifier of the process that created it. Forked processes (e.g., the
+# workers of the remote workflow controller) create their own client instead
+# of sharing the open HTTP connections of the parent process.
+_api_client = (None, None)
+# Lock that guards the creation of the shared REANA Server API client. The
+# client is accessed concurrently by the worker threads of a REANA client.
+# The lock is stored together with the identifier of the process that created
+# it (see api_client_lock).
+_api_client_lock = (os.getpid(), threading.Lock())
+# Maximum number of connections per host in the pool of the HTTP session of
+# the shared REANA Server API client. The pool is enlarged to the maximum
+# number of workers of any REANA client that uses the shared session (see
+# reserve_connections).
+_pool_size = DEFAULT_MAX_WORKERS
+
+
+class RequestError(RuntimeError):
+    """Error for unexpected responses to requests that are sent directly to
+    the REANA Server API. Keeps the status code of the response.
+    """
+    def __init__(self, status_code):
+        """Initialize the error message and the response status code.
+
+        Parameters
+        ----------
+        status_code: int
+            Status code of the HTTP response.
+        """
+        msg = 'expected status code 200 but replied with {}'
+        super(RequestError, self).__init__(msg.format(status_code))
+        self.status_code = status_code
+
+
+def is_transient(ex):
+    """Test if an error for a request to the REANA cluster is transient, i.e.,
+    if the request may succeed when it is repeated. This is the case for
+    connection errors, timeouts and server errors (status code 5xx).
+
+    Parameters
+    ----------
+    ex: Exception
+        Error that was raised for the request.
+
+    Returns
+    -------
+    bool
+    """
+    if isinstance(ex, TRANSIENT_ERRORS):
+        return True
+    status_code = getattr(ex, 'status_code', None)
+    return isinstance(status_code, int) and status_code >= 500
 
-REANA_ACTIVE_STATE = REANA_STATE_PENDING + REANA_STATE_RUNNING
+
+def retry(func):
+    """Decorator for methods that issue idempotent requests to the REANA
+    cluster. Retries the request if a transient error occurs (see
+    is_transient). The delay between attempts is doubled after every failed
+    attempt and contains a random jitter. All other errors and the error of
+    the last attempt are raised.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        for attempt in range(RETRY_ATTEMPTS):
+            try:
+                return func(*args, **kwargs)
+            except Exception as ex:
+                if attempt == RETRY_ATTEMPTS - 1 or not is_transient(ex):
+                    raise
+                delay = RETRY_DELAY * 2 ** attempt
+                time.sleep(delay + random.uniform(0, delay))
+    return wrapper
 
 
 class REANAClient(RemoteClient):
@@ -38,7 +168,11 @@ class REANAClient(RemoteClient):
     required by the workflow engine to execute workflows, cancel workflow
     execution, get workflow status, and download workflow result files.
     """
-    def __init__(self, name=None, access_token=None, reana_client=None):
+    def __init__(
+        self, name=None, access_token=None, reana_client=None,
+        max_workers=None, status_ttl=None, upload_archive=False,
+        archive_environment=None
+    ):
         """Initialize the REANA client. The client requires the REANA access
         token for the user. If the token is not given as an argument the
         default environment variable REANA_ACCESS_TOKEN is expected to contain
@@ -56,6 +190,21 @@ class REANAClient(RemoteClient):
             Access token for the REANA cluster
         reana_client: object, optional
             Client for the REANA Server API.
+        max_workers: int, optional
+            Maximum number of threads that are used for concurrent file
+            uploads and status requests.
+        status_ttl: float, optional
+            Time (in seconds) for which a received workflow status is reused
+            for repeated status requests. By default, caching is disabled.
+        upload_archive: bool, optional
+            Upload all workflow input files as a single compressed archive
+            that is extracted by an additional first step of the workflow.
+            The step runs 'tar -xzf' in the environment given by
+            archive_environment. The container image of the environment has
+            to provide tar with gzip support.
+        archive_environment: string, optional
+            Container image for the archive extraction step. By default, the
+            environment of the first step of the workflow is used.
 
         Raises
         ------
@@ -71,14 +220,48 @@ class REANAClient(RemoteClient):
         if self.token is None:
             raise RuntimeError('REANA access token not defined')
         # Initialize the reana client. If not client is given the api.client
-        # module is used as default
-        if reana_client is None:
-            import reana_client.api.client as client
-            self.reana = client
+        # module is used as default. The module is imported on first access
+        # (see the reana property).
+        self._reana = reana_client
+        # File transfers are sent directly to the REANA Server API using the
+        # shared HTTP session only if the default reana-client module is used.
+        self.shared_session = reana_client is None
+        # Maximum number of concurrent file uploads
+        if max_workers is not None:
+            self.max_workers = max_workers
         else:
-            self.reana = reana_client
+            self.max_workers = DEFAULT_MAX_WORKERS
+        # Ensure that the shared HTTP session keeps a connection for each of
+        # the concurrent requests of the client.
+        if self.shared_session:
+            reserve_connections(self.max_workers)
+        # Cache for workflow status responses of active workflows. Maps the
+        # workflow identifier to a tuple of response time and response.
+        if status_ttl is not None:
+            self.status_ttl = status_ttl
+        else:
+            self.status_ttl = DEFAULT_STATUS_TTL
+        self._status_cache = dict()
+        self.upload_archive = upload_archive
+        self.archive_environment = archive_environment
+
+    @property
+    def reana(self):
+        """Client for the REANA Server API. If no client was given when the
+        REANA client was initialized, the reana-client API module is imported
+        on first access. The module is not referenced by the object so that
+        the REANA client can be pickled when workflows are monitored in a
+        separate process.
 
-    def create_workflow(self, run, template, arguments):
+        Returns
+        -------
+        object
+        """
+        if self._reana is None:
+            return default_api_client()
+        return self._reana
+
+    def create_workflow(self, run, template, arguments, max_workers=None):
         """Create a new instance of a workflow from the given workflow
         template and user-provided arguments. After the workflow is created
         successfully, all required files are uploaded and the workflow is
@@ -93,16 +276,35 @@ class REANAClient(RemoteClient):
             parameter declarations.
         arguments: dict(flowserv.model.parameter.value.TemplateArgument)
             Dictionary of argument values for parameters in the template.
+        max_workers: int, optional
+            Maximum number of threads that are used for concurrent file
+            uploads. By default, the number of workers of the client is used.
 
         Returns
         -------
         flowserv.controller.remote.workflow.RemoteWorkflowHandle
         """
+        # Get the list of all required input files. Directories are expanded
+        # so that all files are transferred concurrently in a single batch.
+        wf = REANAWorkflow(template, arguments)
+        wf_spec = wf.workflow_spec
+        files = list()
+        for source, target in wf.upload_files:
+            files.extend(list_files(source, target))
+        # If input files are uploaded as an archive, the workflow specification
+        # is extended with a step that extracts the archive.
+        archive_spec = None
+        if self.upload_archive and len(files) > 1:
+            archive_spec = add_extract_step(
+                wf_spec,
+                INPUT_ARCHIVE,
+                environment=self.archive_environment
+            )
+        if archive_spec is not None:
+            wf_spec = archive_spec
         # Create workflow instance for the REANA workflow specification at the
         # remote REANA cluster. Retrieves the workflow identifier for further
         # references.
-        wf = REANAWorkflow(template, arguments)
-        wf_spec = wf.workflow_spec
         r = self.reana.create_workflow(wf_spec, self.name, self.token)
         # Expected response schema:
         # "schema": {
@@ -123,8 +325,10 @@ class REANAClient(RemoteClient):
         state = modify_state(response=r, current_state=run.state)
         # Upload all required input files to the workspace of the created
         # workflow.
-        for source, target in wf.upload_files:
-            r = self.upload_file(workflow_id, source, target)
+        if archive_spec is not None:
+            self._upload_archive(workflow_id, files)
+        else:
+            self._upload_files(workflow_id, files, max_workers=max_workers)
         # Start the workflow on the REANA cluster. Keep track of the workflow
         # status as reported by the REANA cluster.
         r = self.reana.start_workflow(workflow_id, self.token, dict())
@@ -155,6 +359,7 @@ class REANAClient(RemoteClient):
             output_files=wf.output_files
         )
 
+    @retry
     def download_file(self, workflow_id, source, target):
         """Download file from relative location at REANA cluster to target
         path.
@@ -168,10 +373,37 @@ class REANAClient(RemoteClient):
         target: string
             Path to target file on local disk
         """
-        raw_bytes = self.reana.download_file(workflow_id, source, self.token)
-        util.create_dir(os.path.dirname(target))
-        with open(target, 'wb') as f:
-            f.write(raw_bytes)
+        # Stream the file content directly to disk if possible. Otherwise, the
+        # full file content is returned by the REANA API client.
+        if self.shared_session:
+            chunks = stream_file(workflow_id, source, self.token)
+        else:
+            token = self.token
+            chunks = [self.reana.download_file(workflow_id, source, token)]
+        # Create the parent directory for the target file with a single call
+        # that does not fail if the directory exists.
+        parent = os.path.dirname(target)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        # Write the file content to a temporary file in the target directory
+        # that replaces the target file after the download has finished. An
+        # existing target file is not modified if the download fails. The
+        # temporary file is created with the same permissions as a new target
+        # file.
+        tmpfile = os.path.join(
+            parent,
+            '.{}.{}'.format(os.path.basename(target), uuid.uuid4().hex)
+        )
+        try:
+            with open(tmpfile, 'xb', buffering=DOWNLOAD_CHUNK_SIZE) as f:
+                for chunk in chunks:
+                    f.write(chunk)
+            os.replace(tmpfile, target)
+        except Exception:
+            # Remove the partially downloaded file.
+            if os.path.isfile(tmpfile):
+                os.remove(tmpfile)
+            raise
 
     def get_workflow_state(self, workflow_id, current_state):
         """Get information about the current state of a given workflow.
@@ -191,7 +423,11 @@ class REANAClient(RemoteClient):
         -------
         flowserv.model.workflw.state.WorkflowState
         """
-        r = self.reana.get_workflow_status(workflow_id, self.token)
+        # The state of an inactive workflow does not change anymore. Avoid the
+        # round-trip to the REANA cluster in this case.
+        if not current_state.is_active():
+            return current_state
+        r = self._get_workflow_status(workflow_id)
         # Expected response schema:
         # "schema": {
         #     "properties": {
@@ -221,6 +457,34 @@ class REANAClient(RemoteClient):
         # }
         return modify_state(response=r, current_state=current_state)
 
+    def get_workflow_states(self, workflows):
+        """Get information about the current state for a set of workflows.
+        The status for all workflows is requested from the REANA cluster
+        concurrently.
+
+        Parameters
+        ----------
+        workflows: dict(string: flowserv.model.workflow.state.WorkflowState)
+            Mapping of unique workflow identifier to the last known state of
+            the workflow.
+
+        Returns
+        -------
+        dict(string: flowserv.model.workflow.state.WorkflowState)
+        """
+        if not workflows:
+            return dict()
+        workers = min(self.max_workers, len(workflows))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = dict()
+            for workflow_id, state in workflows.items():
+                futures[workflow_id] = executor.submit(
+                    self.get_workflow_state,
+                    workflow_id,
+                    state
+                )
+        return {key: f.result() for key, f in futures.items()}
+
     def stop_workflow(self, workflow_id):
         """Stop the execution of the workflow with the given identifier.
 
@@ -229,15 +493,69 @@ class REANAClient(RemoteClient):
         workflow_id: string
             Unique workflow identifier
         """
+        self._status_cache.pop(workflow_id, None)
         self.reana.stop_workflow(workflow_id, True, self.token)
 
+    @retry
+    def _get_workflow_status(self, workflow_id):
+        """Get the status response for the given workflow from the REANA
+        cluster. Responses for active workflows are reused for repeated
+        requests within the status time-to-live interval.
+
+        Parameters
+        ----------
+        workflow_id: string
+            Unique workflow identifier
+
+        Returns
+        -------
+        dict
+        """
+        # Responses are only cached if a positive time-to-live is given.
+        if self.status_ttl <= 0:
+            return self._request_status(workflow_id)
+        now = time.monotonic()
+        cached = self._status_cache.get(workflow_id)
+        if cached is not None and now - cached[0] < self.status_ttl:
+            return cached[1]
+        r = self._request_status(workflow_id)
+        # Only keep the status of active workflows. The workflow controller
+        # stops monitoring a workflow once it has reached an inactive state.
+        if r.get('status') in REANA_ACTIVE_STATE:
+            self._status_cache[workflow_id] = (now, r)
+        else:
+            self._status_cache.pop(workflow_id, None)
+        return r
+
+    def _request_status(self, workflow_id):
+        """Request the status of the given workflow from the REANA cluster.
+
+        If the shared REANA Server API client is used, the request is sent
+        through the client directly. The reana-client replaces all request
+        errors with a generic exception. By calling the API client, errors
+        keep their status code and server errors are retried.
+
+        Parameters
+        ----------
+        workflow_id: string
+            Unique workflow identifier
+
+        Returns
+        -------
+        dict
+        """
+        if self.shared_session:
+            return get_workflow_status(workflow_id, self.token)
+        return self.reana.get_workflow_status(workflow_id, self.token)
+
     def upload_file(self, workflow_id, source, target):
         """Upload a local source file to the target location in the workflow
         workspace on the REANA cluster. This is a wrapper around the respective
         upload file method of the REANA API client.
 
-        The result is either the response dictionary for uploading a file or a
-        list or responses for uploading files in a directory.
+        If the source references a directory, all files in the directory tree
+        are uploaded. Errors for individual files are raised as a single error
+        after all uploads have finished.
 
         Parameters
         ----------
@@ -248,26 +566,468 @@ class REANAClient(RemoteClient):
             Path to file on disk
         target: string
             Relative target path for file in workflow workspace
+
+        Raises
+        ------
+        RuntimeError
         """
-        # If the source references a directorsy the whole directory tree is
-        # copied
-        if os.path.isdir(source):
-            for root, dirs, files in os.walk(source, topdown=False):
-                for next_path in files + dirs:
-                    self.upload_file(
-                        workflow_id,
-                        os.path.join(source, next_path),
-                        os.path.join(target, next_path)
-                    )
-        else:
-            # The REANA client file upload function expects a file object for
-            # the file that is being uploaded.
-            with open(source, 'rb') as f:
+        # If the source references a directory the whole directory tree is
+        # copied. All files in the tree are uploaded concurrently.
+        self._upload_files(workflow_id, list_files(source, target))
+
+    def _upload_archive(self, workflow_id, files):
+        """Upload a list of local files to the workflow workspace on the REANA
+        cluster as a single compressed archive. The archive is created in a
+        temporary file that is removed after the upload.
+
+        Parameters
+        ----------
+        workflow_id: string
+            Unique workflow identifier.
+        files: list((string, string))
+            List of tuples containing the path to the source file on disk and
+            the relative target path in the workflow workspace.
+        """
+        fd, filename = tempfile.mkstemp(suffix='.tar.gz')
+        os.close(fd)
+        try:
+            # Symbolic links are followed when listing the input files. Add
+            # the link targets to the archive so that the workspace contains
+            # the file content instead of links that cannot be resolved there.
+            with tarfile.open(filename, 'w:gz', dereference=True) as tar:
+                for source, target in files:
+                    tar.add(source, arcname=target)
+            self._upload_one(workflow_id, filename, INPUT_ARCHIVE)
+        finally:
+            os.remove(filename)
+
+    def _upload_files(self, workflow_id, files, max_workers=None):
+        """Upload a list of local files to the workflow workspace on the REANA
+        cluster. Uploads are executed concurrently using a pool of worker
+        threads. Errors for individual files are collected and raised as a
+        single error after all uploads have finished.
+
+        Parameters
+        ----------
+        workflow_id: string
+            Unique workflow identifier.
+        files: list((string, string))
+            List of tuples containing the path to the source file on disk and
+            the relative target path in the workflow workspace.
+        max_workers: int, optional
+            Maximum number of concurrent uploads. By default, the number of
+            workers of the client is used.
+
+        Raises
+        ------
+        RuntimeError
+        """
+        if not files:
+            return
+        errors = list()
+        if max_workers is None:
+            max_workers = self.max_workers
+        workers = min(max_workers, len(files))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(self._upload_one, workflow_id, source, target)
+                for source, target in files
+            ]
+            for (source, _), future in zip(files, futures):
+                ex = future.exception()
+                if ex is not None:
+                    errors.append('{} ({})'.format(source, ex))
+        if errors:
+            msg = 'failed to upload {}'.format(', '.join(errors))
+            raise RuntimeError(msg)
+
+    def _upload_one(self, workflow_id, source, target):
+        """Upload a single local file to the target location in the workflow
+        workspace on the REANA cluster.
+
+        Parameters
+        ----------
+        workflow_id: string
+            Unique workflow identifier.
+        source: string
+            Path to file on disk
+        target: string
+            Relative target path for file in workflow workspace
+        """
+        # The REANA client file upload function expects a file object for
+        # the file that is being uploaded. The HTTP client reads the object in
+        # small blocks. Use a large read buffer so that these reads do not
+        # result in a separate system call each. A buffer is allocated per
+        # file since uploads run concurrently.
+        with open(source, 'rb', buffering=UPLOAD_BUFFER_SIZE) as f:
+            if self.shared_session:
+                post_file(workflow_id, f, target, self.token)
+            else:
                 self.reana.upload_file(workflow_id, f, target, self.token)
 
 
 # -- Helper Methods -----------------------------------------------------------
 
+def add_extract_step(workflow_spec, archive, environment=None):
+    """Get a modified copy of a serial workflow specification where the first
+    step extracts the given archive file in the workflow workspace. Unless an
+    environment is given, the step uses the environment of the original first
+    workflow step. The container image of the environment has to provide tar
+    with gzip support.
+
+    Returns None if the specification does not contain any workflow steps.
+
+    Parameters
+    ----------
+    workflow_spec: dict
+        REANA workflow specification.
+    archive: string
+        Relative path to the archive file in the workflow workspace.
+    environment: string, optional
+        Container image for the extraction step.
+
+    Returns
+    -------
+    dict
+    """
+    workflow = workflow_spec.get('workflow', {})
+    specification = workflow.get('specification', {})
+    steps = specification.get('steps', [])
+    if not steps:
+        return None
+    if environment is None:
+        environment = steps[0].get('environment')
+    step = {
+        'environment': environment,
+        'commands': ['tar -xzf {0} && rm {0}'.format(archive)]
+    }
+    specification = dict(specification)
+    specification['steps'] = [step] + list(steps)
+    workflow = dict(workflow)
+    workflow['specification'] = specification
+    spec = dict(workflow_spec)
+    spec['workflow'] = workflow
+    return spec
+
+
+def default_api_client():
+    """Get the reana-client API module that is used as the default client for
+    the REANA Server API.
+
+    The reana-client module accesses the REANA Server through a proxy that
+    creates a new Swagger client (with a new HTTP session) on every call. The
+    proxy is replaced by one that returns a single shared client instance.
+    This way, HTTP connections are kept alive and reused across all API calls
+    in the process. File uploads and downloads use the same HTTP session (see
+    post_file and stream_file). The shared client is created lazily on first
+    access in each process.
+
+    Note that the proxy is replaced in the reana-client module. All users of
+    the reana-client API in the process therefore use the shared client once
+    this function has been called.
+
+    Returns
+    -------
+    module
+    """
+    import reana_client.api.client as client
+    from werkzeug.local import LocalProxy
+    if not getattr(client, '_flowserv_shared_client', False):
+        client.current_rs_api_client = LocalProxy(shared_api_client)
+        client._flowserv_shared_client = True
+    return client
+
+
+def api_client_lock():
+    """Get the lock that guards the shared REANA Server API client. A process
+    that was forked from the process that created the lock creates a new
+    lock. The lock of the parent process may have been held by another thread
+    at the time of the fork. This thread does not exist in the forked process
+    and would never release the lock.
+
+    Returns
+    -------
+    threading.Lock
+    """
+    global _api_client_lock
+    pid, lock = _api_client_lock
+    if pid != os.getpid():
+        lock = threading.Lock()
+        _api_client_lock = (os.getpid(), lock)
+    return lock
+
+
+def shared_api_client():
+    """Get the shared client for the REANA Server API. Creates the client on
+    first access in the current process. A process that was forked from the
+    process that created the client will create a new client, since HTTP
+    connections cannot safely be shared between processes. The client is
+    created only once if it is accessed concurrently by multiple threads.
+    The HTTP session of the client is configured with a connection pool that
+    is large enough for the maximum number of concurrent requests that are
+    issued by a REANA client (see reserve_connections).
+
+    Returns
+    -------
+    bravado.client.SwaggerClient
+    """
+    global _api_client
+    with api_client_lock():
+        pid, api_client = _api_client
+        if api_client is None or pid != os.getpid():
+            from reana_commons.api_client import get_current_api_client
+            api_client = get_current_api_client(component='reana-server')
+            session = api_client.swagger_spec.http_client.session
+            mount_adapters(session, _pool_size)
+            _api_client = (os.getpid(), api_client)
+    return api_client
+
+
+def mount_adapters(session, pool_size):
+    """Mount HTTP adapters with a connection pool of the given size for all
+    requests of the given HTTP session.
+
+    Parameters
+    ----------
+    session: requests.Session
+        HTTP session of the shared REANA Server API client.
+    pool_size: int
+        Maximum number of connections that are kept per host.
+    """
+    from requests.adapters import HTTPAdapter
+    for prefix in ['http://', 'https://']:
+        session.mount(
+            prefix,
+            HTTPAdapter(
+                pool_connections=pool_size,
+                pool_maxsize=pool_size,
+                max_retries=HTTP_MAX_RETRIES
+            )
+        )
+
+
+def reserve_connections(pool_size):
+    """Ensure that the connection pool of the HTTP session of the shared
+    REANA Server API client keeps at least the given number of connections per
+    host. Connections for concurrent requests that exceed the size of the pool
+    are discarded instead of being reused. If the shared client has already
+    been created in the current process, new adapters with a larger pool are
+    mounted for the session.
+
+    Parameters
+    ----------
+    pool_size: int
+        Maximum number of concurrent requests.
+    """
+    global _pool_size
+    with api_client_lock():
+        if pool_size <= _pool_size:
+            return
+        _pool_size = pool_size
+        pid, api_client = _api_client
+        if api_client is not None and pid == os.getpid():
+            session = api_client.swagger_spec.http_client.session
+            mount_adapters(session, pool_size)
+
+
+def get_workflow_status(workflow_id, access_token):
+    """Get the status of a workflow at the REANA cluster using the shared
+    REANA Server API client. Errors that are raised by the API client for
+    failed requests, e.g., server errors with a status code 5xx, are not
+    modified.
+
+    Parameters
+    ----------
+    workflow_id: string
+        Unique workflow identifier
+    access_token: string
+        Access token for the REANA cluster
+
+    Returns
+    -------
+    dict
+
+    Raises
+    ------
+    flowservreana.client.RequestError
+    """
+    response, http_response = shared_api_client().api.get_workflow_status(
+        workflow_id_or_name=workflow_id,
+        access_token=access_token
+    ).result()
+    if http_response.status_code != 200:
+        raise RequestError(http_response.status_code)
+    return response
+
+
+def post_file(workflow_id, file, file_name, access_token):
+    """Upload a file to the workspace of a workflow at the REANA cluster. In
+    contrast to the upload function of the reana-client, which opens a new
+    HTTP connection for every file, the request is sent using the HTTP
+    session of the shared REANA Server API client. The request URL is taken
+    from the path of the upload operation in the Swagger specification of the
+    client.
+
+    Parameters
+    ----------
+    workflow_id: string
+        Unique workflow identifier
+    file: FileObject
+        Content of the file that is being uploaded
+    file_name: string
+        Relative path of the target file in the workflow workspace
+    access_token: string
+        Access token for the REANA cluster
+
+    Returns
+    -------
+    dict
+
+    Raises
+    ------
+    flowservreana.client.RequestError
+    """
+    api_client = shared_api_client()
+    endpoint = api_client.api.upload_file.operation.path_name.format(
+        workflow_id_or_name=workflow_id
+    )
+    session = api_client.swagger_spec.http_client.session
+    r = session.post(
+        urljoin(api_client.swagger_spec.api_url, endpoint),
+        data=file,
+        params={'file_name': file_name, 'access_token': access_token},
+        headers={'Content-Type': 'application/octet-stream'},
+        verify=False
+    )
+    if r.status_code != 200:
+        raise RequestError(r.status_code)
+    return r.json()
+
+
+def stream_file(workflow_id, file_name, access_token):
+    """Download a file from the workspace of a workflow at the REANA cluster.
+    Returns an iterator over chunks of the file content. In contrast to the
+    download function of the reana-client, the file content is not held in
+    memory as a whole.
+
+    Parameters
+    ----------
+    workflow_id: string
+        Unique workflow identifier
+    file_name: string
+        Relative path to the file in the workflow workspace
+    access_token: string
+        Access token for the REANA cluster
+
+    Returns
+    -------
+    iterator(bytes)
+
+    Raises
+    ------
+    flowservreana.client.RequestError
+    """
+    api_client = shared_api_client()
+    endpoint = api_client.api.download_file.operation.path_name.format(
+        workflow_id_or_name=workflow_id,
+        file_name=file_name
+    )
+    session = api_client.swagger_spec.http_client.session
+    r = session.get(
+        urljoin(api_client.swagger_spec.api_url, endpoint),
+        params={'access_token': access_token},
+        stream=True,
+        verify=False
+    )
+    try:
+        if r.status_code != 200:
+            raise RequestError(r.status_code)
+        for chunk in r.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+            yield chunk
+    finally:
+        r.close()
+
+
+def get_default_client():
+    """Get the default REANA client. The client is created on first access
+    and then shared by all workflow controllers in the process. This way, the
+    controllers share the HTTP connections to the REANA cluster.
+
+    Returns
+    -------
+    flowservreana.client.REANAClient
+
+    Raises
+    ------
+    RuntimeError
+    """
+    global _default_client
+    if _default_client is None:
+        _default_client = REANAClient()
+    return _default_client
+
+
+def list_files(source, target):
+    """Get list of all files that need to be uploaded for a given source path.
+    If the source references a directory the list contains all files in the
+    directory tree. Collects all files in a single pass over the tree.
+
+    Returns a list of tuples containing the path to the source file on disk
+    and the relative target path in the workflow workspace.
+
+    Parameters
+    ----------
+    source: string
+        Path to file or directory on disk
+    target: string
+        Relative target path for file or directory in workflow workspace
+
+    Returns
+    -------
+    list((string, string))
+    """
+    if not os.path.isdir(source):
+        return [(source, target)]
+    # Scan the directory tree using the cached file type information of the
+    # directory entries. Target paths in the workflow workspace are POSIX
+    # paths. Symbolic links to directories are followed. Each directory on
+    # the stack keeps the identifiers of its ancestors to detect cycles. All
+    # other entries are included in the list, including broken symbolic
+    # links, so that an error is raised when they are uploaded.
+    files = list()
+    dirs = [(source, target, frozenset([dir_key(os.stat(source))]))]
+    while dirs:
+        sourcedir, targetdir, ancestors = dirs.pop()
+        # Prefix for target paths of all entries in the directory.
+        prefix = posixpath.join(targetdir, '')
+        for entry in os.scandir(sourcedir):
+            targetpath = prefix + entry.name
+            if entry.is_dir():
+                key = dir_key(entry.stat())
+                if key in ancestors:
+                    msg = "symbolic link cycle at '{}'".format(entry.path)
+                    raise ValueError(msg)
+                dirs.append((entry.path, targetpath, ancestors | {key}))
+            else:
+                files.append((entry.path, targetpath))
+    return files
+
+
+def dir_key(stat):
+    """Get a key that uniquely identifies a directory on disk.
+
+    Parameters
+    ----------
+    stat: os.stat_result
+        Result of a stat call for the directory.
+
+    Returns
+    -------
+    tuple
+    """
+    return (stat.st_dev, stat.st_ino)
+
+
 def modify_state(response, current_state):
     """Modify the current workflow state based on the response from the REANA
     cluster. Expects that the response contains at least the 'status' element
@@ -284,16 +1044,80 @@ def modify_state(response, current_state):
     -------
     flowserv.model.workflow.state.WorkflowState
     """
-    status = response.get('status')
-    if status in REANA_STATE_RUNNING and current_state.is_pending():
+    transition = STATE_TRANSITIONS.get(response.get('status'))
+    if transition is None:
+        return current_state
+    return transition(response, current_state)
+
+
+def start_state(response, current_state):
+    """State transition for running REANA workflows. Returns a running state
+    if the current state is pending.
+
+    Parameters
+    ----------
+    response: dict
+        Response object received from the REANA API.
+    current_state: flowserv.model.workflw.state.WorkflowState
+        Last known state of the workflow by the workflow controller
+
+    Returns
+    -------
+    flowserv.model.workflow.state.WorkflowState
+    """
+    if current_state.is_pending():
         return current_state.start()
-    elif status in REANA_STATE_ERROR and current_state.is_active():
+    return current_state
+
+
+def error_state(response, current_state):
+    """State transition for failed REANA workflows. Returns an error state if
+    the current state is active.
+
+    Parameters
+    ----------
+    response: dict
+        Response object received from the REANA API.
+    current_state: flowserv.model.workflw.state.WorkflowState
+        Last known state of the workflow by the workflow controller
+
+    Returns
+    -------
+    flowserv.model.workflow.state.WorkflowState
+    """
+    if current_state.is_active():
         # The logs element containing error messages is optional in the API
         # response.
         msg = response.get('logs', 'unknown reason')
         return current_state.error(messages=[msg])
-    elif status in REANA_STATE_SUCCESS and current_state.is_active():
+    return current_state
+
+
+def success_state(response, current_state):
+    """State transition for finished REANA workflows. Returns a success state
+    if the current state is active.
+
+    Parameters
+    ----------
+    response: dict
+        Response object received from the REANA API.
+    current_state: flowserv.model.workflw.state.WorkflowState
+        Last known state of the workflow by the workflow controller
+
+    Returns
+    -------
+    flowserv.model.workflow.state.WorkflowState
+    """
+    if current_state.is_active():
         # Return a success state. The list of generated resources is left
         # empty. The resource list will be updated by the workflow controller.
         return current_state.success()
     return current_state
+
+
+"""Mapping of REANA workflow states to the respective state transition
+function. Pending REANA workflow states do not modify the workflow state.
+"""
+STATE_TRANSITIONS = {s: start_state for s in REANA_STATE_RUNNING}
+STATE_TRANSITIONS.update({s: error_state for s in REANA_STATE_ERROR})
+STATE_TRANSITIONS.update({s: success_state for s in REANA_STATE_SUCCESS})
@@ -10,12 +10,26 @@
 cluster for workflow execution.
 """
 
+import logging
+
+from concurrent.futures import ThreadPoolExecutor
+
 from flowserv.controller.remote.engine import RemoteWorkflowController
+from flowserv.controller.remote.engine import run_workflow
 from flowserv.model.template.base import WorkflowTemplate
-from flowservreana.client import REANAClient
+from flowservreana.client import get_default_client
 
 import flowserv.core.error as err
+import flowserv.core.util as util
 import flowserv.model.template.parameter as tp
+import flowserv.model.workflow.state as serialize
+
+
+"""Process-wide default arguments for new workflow controllers. Values are
+set using the configure function. A value of None means that the default of
+the workflow controller is used.
+"""
+_DEFAULTS = {'client': None, 'is_async': None}
 
 
 class REANAWorkflowController(RemoteWorkflowController):
@@ -30,17 +44,112 @@ class REANAWorkflowController(RemoteWorkflowController):
 
         Parameters
         ----------
-        client: flowservreana.client.REANAClient
-            Client to interact with the REANA cluster.
+        client: flowservreana.client.REANAClient, optional
+            Client to interact with the REANA cluster. By default, the client
+            from the process-wide configuration or the client that is shared
+            by all controllers in the process is used.
         is_async: bool, optional
             Flag that determines whether workflows execution is synchronous or
-            asynchronous by default.
+            asynchronous by default. If not given, the flag from the
+            process-wide configuration is used.
         """
+        if client is None:
+            client = _DEFAULTS['client']
+            if client is None:
+                client = get_default_client()
+        if is_async is None:
+            is_async = _DEFAULTS['is_async']
         super(REANAWorkflowController, self).__init__(
-            client=client if client is not None else REANAClient(),
+            client=client,
             is_async=is_async
         )
 
+    def exec_workflows(self, runs, max_workers=None):
+        """Execute multiple workflow runs. The workflows for all runs are
+        created, their input files are uploaded, and they are started at the
+        REANA cluster concurrently in a pool of threads. After all workflows
+        have been submitted, they are monitored from the calling thread until
+        they are no longer active. Returns the list of final workflow states
+        in the same order as the given runs.
+
+        As for exec_workflow, the final workflow states are not stored in the
+        database. The caller is expected to update each run with the returned
+        state (e.g., using the update_run method of the run service) so that
+        the run results are stored as well.
+
+        Runs are never monitored asynchronously by this method. Asynchronous
+        execution forks a monitoring process for every run. A process that is
+        forked while other threads are active could inherit locks (e.g., of
+        the HTTP connection pool) that are held by these threads at that time.
+
+        Parameters
+        ----------
+        runs: list(tuple)
+            List of (run, template, arguments) triples that are passed to
+            exec_workflow.
+        max_workers: int, optional
+            Maximum number of runs that are submitted concurrently. The value
+            is limited by the number of workers of the REANA client, which is
+            also used by default. Each run uploads its files in a separate
+            pool of threads. The size of these pools is chosen such that the
+            total number of concurrent uploads does not exceed the number of
+            workers of the client.
+
+        Returns
+        -------
+        list(flowserv.model.workflow.state.WorkflowState)
+
+        Raises
+        ------
+        RuntimeError
+        """
+        # Ensure that all runs are in pending state before submitting any of
+        # the workflows.
+        for run, _, _ in runs:
+            if not run.is_pending():
+                raise RuntimeError("invalid run state '{}'".format(run.state))
+        if not runs:
+            return list()
+        workers = self.client.max_workers
+        if max_workers is not None:
+            workers = min(workers, max_workers)
+        workers = min(workers, len(runs))
+        # Limit the number of concurrent uploads for each run so that the
+        # total number of concurrent requests does not exceed the number of
+        # workers of the client.
+        upload_workers = max(1, self.client.max_workers // workers)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(
+                    self.client.create_workflow,
+                    run,
+                    template,
+                    arguments,
+                    max_workers=upload_workers
+                ) for run, template, arguments in runs
+            ]
+        # Monitor the submitted workflows one after the other. All workflows
+        # are executed concurrently by the REANA cluster in the meantime.
+        states = list()
+        for (run, _, _), future in zip(runs, futures):
+            try:
+                wf = future.result()
+            except Exception as ex:
+                # Set the workflow run into an ERROR state.
+                logging.error(ex)
+                states.append(run.state.error(messages=util.stacktrace(ex)))
+                continue
+            _, state_dict = run_workflow(
+                run.identifier,
+                run.rundir,
+                wf.identifier,
+                wf.state,
+                wf.output_files,
+                self.client
+            )
+            states.append(serialize.deserialize_state(state_dict))
+        return states
+
     def modify_template(self, template, parameters):
         """Modify a the workflow specification in a given template by adding
         the a set of parameters. If a parameter in the added parameters set
@@ -76,26 +185,31 @@ class REANAWorkflowController(RemoteWorkflowController):
         if workflow_type != 'serial':
             msg = "invalid workflow type '{}'".format(workflow_type)
             raise err.InvalidTemplateError(msg)
-        # Get a copy of the files and parameters sections of the inputs
-        # declaration
-        inputs = workflow_spec.get('inputs', dict())
-        in_files = list(inputs.get('files', list()))
-        in_params = dict(inputs.get('parameters', dict()))
-        # Ensure that the identifier for all parameters are unique
-        para_merge = dict(template.parameters)
-        for para in parameters.values():
-            if para.identifier in para_merge:
-                para = para_merge[para.identifier].merge(para)
-            para_merge[para.identifier] = para
-            # Depending on whether the type of the parameter is a file or not we
-            # add a parameter reference to the respective input section
+        inputs = workflow_spec.get('inputs') or {}
+        in_files = list(inputs.get('files') or [])
+        in_params = (inputs.get('parameters') or {}).copy()
+        # Merge the template parameters with the additional parameters. All
+        # parameters are added in a single dictionary merge. Only parameters
+        # that exist in the template are merged individually. Depending on
+        # whether the type of the parameter is a file or not we add a
+        # parameter reference to the respective input section.
+        para_merge = {**template.parameters, **parameters}
+        for pid, para in parameters.items():
+            existing = template.parameters.get(pid)
+            if existing is not None:
+                para = existing.merge(para)
+                para_merge[pid] = para
             if para.is_file():
-                in_files.append(tp.VARIABLE(para.identifier))
-            else:
-                if para.identifier not in in_params:
-                    in_params[para.identifier] = tp.VARIABLE(para.identifier)
-        spec = dict(workflow_spec)
-        spec['inputs'] = {'files': in_files, 'parameters': in_params}
+                in_files.append(tp.VARIABLE(pid))
+            elif pid not in in_params:
+                in_params[pid] = tp.VARIABLE(pid)
+        spec = {
+            **workflow_spec,
+            'inputs': {
+                'files': in_files,
+                'parameters': in_params
+            }
+        }
         return WorkflowTemplate(
             workflow_spec=spec,
             sourcedir=template.sourcedir,
@@ -104,3 +218,25 @@ class REANAWorkflowController(RemoteWorkflowController):
             postproc_spec=template.postproc_spec,
             result_schema=template.result_schema
         )
+
+
+# -- Helper Methods -----------------------------------------------------------
+
+def configure(**kwargs):
+    """Set process-wide default arguments for new workflow controllers. Valid
+    arguments are 'client' and 'is_async'. Setting an argument to None
+    restores the default behavior of the workflow controller.
+
+    Parameters
+    ----------
+    kwargs: dict
+        Default values for workflow controller arguments.
+
+    Raises
+    ------
+    ValueError
+    """
+    for key in kwargs:
+        if key not in _DEFAULTS:
+            raise ValueError("unknown argument '{}'".format(key))
+    _DEFAULTS.update(kwargs)
@@ -8,12 +8,42 @@
 
 """Fake REANA API for test purposes."""
 
+import errno
+import hashlib
 import os
+import shutil
+import sys
+import tempfile
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 import flowserv.core.util as util
 import flowservreana.client as rn
 
 
+# Size of blocks (in bytes) that are copied when uploading files.
+COPY_BLOCK_SIZE = 1024 * 1024
+# Name of the directory for the content of uploaded files.
+BLOB_DIR = '.blobs'
+# Copy files using os.sendfile. Only Linux supports regular files as the
+# target of sendfile (as in shutil).
+USE_SENDFILE = hasattr(os, 'sendfile') and sys.platform.startswith('linux')
+
+"""REANA workflow states that are reported by the test API."""
+STATE_CREATED = 'created'
+STATE_RUNNING = 'running'
+STATE_FAILED = 'failed'
+STATE_FINISHED = 'finished'
+
+"""Transitions for workflows that are in a pending state. Pending workflows
+start running with the next status request.
+"""
+NEXT_STATE = {s: STATE_RUNNING for s in rn.REANA_STATE_PENDING}
+
+
 class REANATestAPI(object):
     """Implementation of all REANA API methods that are used by the REANAClient
     implementation. Used to simulate the execution of a workflow at the REANA
@@ -32,7 +62,13 @@ class REANATestAPI(object):
             Path to base directory for workflow runs
         """
         self.basedir = basedir
-        self.status = None
+        # Current REANA status for each workflow.
+        self._status = dict()
+        # Directory for the content of uploaded files. Files are stored under
+        # the hash of their content.
+        self._blobdir = os.path.join(basedir, BLOB_DIR)
+        # Cache for the paths of workflow directories.
+        self._workflowdirs = dict()
 
     def create_workflow(self, workflow_spec, name, token):
         """Simulate creation of a workflow at the backend. Generates a unique
@@ -53,8 +89,12 @@ class REANATestAPI(object):
         flowserv.controller.remote.wrokflow.RemoteWorkflowHandle
         """
         workflow_id = util.get_unique_identifier()
-        util.create_dir(os.path.join(self.basedir, workflow_id))
-        self.status = rn.REANA_STATE_PENDING[0]
+        # The workflow identifier is unique. Create the workflow directory
+        # and the results directory (and any missing parent directories) with
+        # a single call. This way, no directories need to be created when the
+        # workflow status is polled.
+        os.makedirs(os.path.join(self._workflow_dir(workflow_id), 'results'))
+        self._status[workflow_id] = STATE_CREATED
         return {'workflow_id': workflow_id}
 
     def download_file(self, workflow_id, file_name, token):
@@ -69,7 +109,7 @@ class REANATestAPI(object):
         token: string
             REANA access token.
         """
-        workflowdir = os.path.join(self.basedir, workflow_id)
+        workflowdir = self._workflow_dir(workflow_id)
         with open(os.path.join(workflowdir, file_name), 'rb') as f:
             return f.read()
 
@@ -83,22 +123,22 @@ class REANATestAPI(object):
         token: string
             REANA access token.
         """
-        status = self.status
-        if status in rn.REANA_STATE_PENDING:
-            self.status = rn.REANA_STATE_RUNNING[0]
-        elif status in rn.REANA_STATE_RUNNING:
-            workflowdir = os.path.join(self.basedir, workflow)
+        status = self._status.get(workflow)
+        next_state = NEXT_STATE.get(status)
+        if next_state is not None:
+            self._status[workflow] = next_state
+        elif status == STATE_RUNNING:
+            workflowdir = self._workflow_dir(workflow)
             infile = os.path.join(workflowdir, 'inputs/to-do.json')
-            doc = util.read_object(filename=infile)
+            doc = self._read_object(infile)
             if doc['action'] == 'ERROR':
-                self.status = rn.REANA_STATE_ERROR[0]
+                self._status[workflow] = STATE_FAILED
             else:
-                self.status = rn.REANA_STATE_SUCCESS[0]
-                util.create_dir(os.path.join(workflowdir, 'results'))
+                self._status[workflow] = STATE_FINISHED
                 outfile = os.path.join(workflowdir, 'results/outputs.json')
                 print('create output file {}'.format(outfile))
                 util.write_object(obj=doc, filename=outfile)
-        return {'status': self.status}
+        return {'status': self._status.get(workflow)}
 
     def start_workflow(self, workflow, token, parameters):
         """Simulate starting a workflow. Has no effect. Workflows are started
@@ -144,7 +184,139 @@ class REANATestAPI(object):
         token: string
             REANA access token.
         """
-        workflowdir = os.path.join(self.basedir, workflow_id)
-        util.create_directories(workflowdir, [filename])
-        with open(os.path.join(workflowdir, filename), 'wb') as f:
-            f.write(file.read())
+        target = os.path.join(self._workflow_dir(workflow_id), filename)
+        # Files may be uploaded concurrently. Create the parent directory in
+        # a single call that does not fail if the directory exists.
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        # Remove an existing target file first. The file may be a link to the
+        # stored content of a previously uploaded file.
+        try:
+            os.remove(target)
+        except FileNotFoundError:
+            pass
+        # The same input files are uploaded for every workflow run. Store the
+        # content of each file once and link the workflow files to the stored
+        # copy instead of copying the content again.
+        key = file_key(file)
+        if key is None:
+            with open(target, 'wb') as f:
+                copy_file(file, f)
+            return
+        blob = os.path.join(self._blobdir, key)
+        if not os.path.isfile(blob):
+            # Write the content to a temporary file first. Concurrent uploads
+            # of the same content replace the file with identical content.
+            os.makedirs(self._blobdir, exist_ok=True)
+            fd, tmpfile = tempfile.mkstemp(dir=self._blobdir)
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    copy_file(file, f)
+                os.replace(tmpfile, blob)
+            except Exception:
+                os.remove(tmpfile)
+                raise
+        try:
+            os.link(blob, target)
+        except OSError:
+            shutil.copyfile(blob, target)
+
+    def _workflow_dir(self, workflow_id):
+        """Get the path to the directory for the workflow with the given
+        identifier. Paths are cached since the directory is accessed for
+        every status request.
+
+        Parameters
+        ----------
+        workflow_id: string
+            Unique workflow identifier.
+
+        Returns
+        -------
+        string
+        """
+        workflowdir = self._workflowdirs.get(workflow_id)
+        if workflowdir is None:
+            workflowdir = os.path.join(self.basedir, workflow_id)
+            self._workflowdirs[workflow_id] = workflowdir
+        return workflowdir
+
+    def _read_object(self, filename):
+        """Read a JSON object from file. Uses the faster orjson parser if
+        the package is installed.
+
+        Parameters
+        ----------
+        filename: string
+            Path to the input file.
+
+        Returns
+        -------
+        dict
+        """
+        if orjson is not None:
+            with open(filename, 'rb') as f:
+                return orjson.loads(f.read())
+        return util.read_object(filename=filename)
+
+
+# -- Helper Methods -----------------------------------------------------------
+
+def copy_file(fsrc, fdst):
+    """Copy the content of a source file object to a target file object. If
+    both objects reference files on disk the content is copied by the kernel
+    using os.sendfile (on Linux). Otherwise, the content is copied in blocks
+    using shutil.copyfileobj.
+
+    Parameters
+    ----------
+    fsrc: FileObject
+        File object for the source file.
+    fdst: FileObject
+        File object for the target file.
+    """
+    try:
+        in_fd = fsrc.fileno()
+        out_fd = fdst.fileno()
+        offset = fsrc.tell()
+    except (AttributeError, OSError):
+        in_fd = None
+    if in_fd is not None and USE_SENDFILE:
+        fdst.flush()
+        try:
+            while True:
+                sent = os.sendfile(out_fd, in_fd, offset, COPY_BLOCK_SIZE)
+                if sent == 0:
+                    return
+                offset += sent
+        except OSError as ex:
+            if ex.errno not in [errno.EINVAL, errno.ENOSYS, errno.ENOTSUP]:
+                raise
+            # Continue copying the remaining content in user space.
+            fsrc.seek(offset)
+    shutil.copyfileobj(fsrc, fdst, COPY_BLOCK_SIZE)
+
+
+def file_key(file):
+    """Get a key that identifies the content of a seekable file object. The
+    key is the SHA-256 hash of the remaining file content. The file object is
+    positioned at its original offset afterwards. Returns None if the file
+    object is not seekable.
+
+    Parameters
+    ----------
+    file: FileObject
+        File object for an uploaded file.
+
+    Returns
+    -------
+    string
+    """
+    try:
+        offset = file.tell()
+    except (AttributeError, OSError, ValueError):
+        return None
+    digest = hashlib.sha256()
+    for block in iter(lambda: file.read(COPY_BLOCK_SIZE), b''):
+        digest.update(block)
+    file.seek(offset)
+    return digest.hexdigest()
@@ -28,6 +28,10 @@ class REANAWorkflow(object):
         """
         self.template = template
         self.arguments = arguments
+        # Expanded workflow specification and list of upload files. Both are
+        # computed on first access.
+        self._workflow_spec = None
+        self._upload_files = None
 
     @property
     def output_files(self):
@@ -43,12 +47,8 @@ class REANAWorkflow(object):
         flowserv.core.error.InvalidTemplateError
         flowserv.core.error.MissingArgumentError
         """
-        workflow_spec = self.template.workflow_spec
-        return tp.replace_args(
-            spec=workflow_spec.get('outputs', {}).get('files', {}),
-            arguments=self.arguments,
-            parameters=self.template.parameters
-        )
+        # Output files are taken from the expanded workflow specification.
+        return self.workflow_spec.get('outputs', {}).get('files', [])
 
     @property
     def upload_files(self):
@@ -74,13 +74,18 @@ class REANAWorkflow(object):
         flowserv.core.error.MissingArgumentError
         flowserv.core.error.UnknownParameterError
         """
-        workflow_spec = self.template.workflow_spec
-        return tp.get_upload_files(
-            template=self.template,
-            basedir=self.template.sourcedir,
-            files=workflow_spec.get('inputs', {}).get('files', []),
-            arguments=self.arguments,
-        )
+        # The list of upload files is computed from the original workflow
+        # specification since references to file parameters in the expanded
+        # specification no longer contain the source files.
+        if self._upload_files is None:
+            workflow_spec = self.template.workflow_spec
+            self._upload_files = tp.get_upload_files(
+                template=self.template,
+                basedir=self.template.sourcedir,
+                files=workflow_spec.get('inputs', {}).get('files', []),
+                arguments=self.arguments,
+            )
+        return self._upload_files
 
     @property
     def workflow_spec(self):
@@ -98,9 +103,12 @@ class REANAWorkflow(object):
         """
         # Get the input/parameters dictionary from the workflow specification
         # and replace all references to template parameters with the given
-        # arguments or default values.
-        return tp.replace_args(
-            spec=self.template.workflow_spec,
-            arguments=self.arguments,
-            parameters=self.template.parameters
-        )
+        # arguments or default values. The full specification is expanded
+        # only once.
+        if self._workflow_spec is None:
+            self._workflow_spec = tp.replace_args(
+                spec=self.template.workflow_spec,
+                arguments=self.arguments,
+                parameters=self.template.parameters
+            )
+        return self._workflow_spec
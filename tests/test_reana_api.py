@@ -0,0 +1,339 @@
+# This file is part of the Reproducible and Reusable Data Analysis Workflow
+# Server (flowServ).
+#
+# Copyright (C) 2019-2020 NYU.
+#
+# flowServ is free software; you can redistribute it and/or modify it under the
+# terms of the MIT License; see LICENSE file for more details.
+
+"""Unit tests for the shared REANA Server API client. The reana-client and
+the bravado client are replaced by fake modules.
+"""
+
+import os
+import pytest
+import sys
+import time
+import types
+
+from concurrent.futures import ThreadPoolExecutor
+
+from flowserv.model.workflow.state import StatePending
+from flowservreana.client import REANAClient
+
+import flowservreana.client as rn
+
+
+class FakeResponse(object):
+    """Fake response object for HTTP requests issued by the fake session."""
+    def __init__(self, status_code, content=b''):
+        self.status_code = status_code
+        self.content = content
+        self.closed = False
+
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i:i + chunk_size]
+
+    def close(self):
+        self.closed = True
+
+    def json(self):
+        return {'message': 'ok'}
+
+
+class FakeSession(object):
+    """Fake HTTP session that records all requests. Returns the given
+    response for every request.
+    """
+    def __init__(self):
+        self.adapters = dict()
+        self.requests = list()
+        self.response = FakeResponse(200)
+
+    def get(self, url, **kwargs):
+        self.requests.append(('GET', url, kwargs))
+        return self.response
+
+    def mount(self, prefix, adapter):
+        self.adapters[prefix] = adapter
+
+    def post(self, url, **kwargs):
+        kwargs['data'] = kwargs['data'].read()
+        self.requests.append(('POST', url, kwargs))
+        return self.response
+
+
+class FakeHTTPError(Exception):
+    """Fake bravado error for failed requests. Like the bravado HTTPError,
+    the error has the response status code as an attribute.
+    """
+    def __init__(self, status_code):
+        super(FakeHTTPError, self).__init__(status_code)
+        self.status_code = status_code
+
+
+class FakeStatusOperation(object):
+    """Fake bravado operation for workflow status requests. Records the
+    arguments of all requests. The errors in the list of errors are raised
+    (in order) for the first requests. All other requests return the status
+    of a running workflow with the given response.
+    """
+    def __init__(self):
+        self.errors = list()
+        self.requests = list()
+        self.response = FakeResponse(200)
+
+    def __call__(self, **kwargs):
+        self.requests.append(kwargs)
+        return types.SimpleNamespace(result=self.result)
+
+    def result(self):
+        if self.errors:
+            raise self.errors.pop(0)
+        return {'status': 'running'}, self.response
+
+
+def operation(path_name):
+    """Shortcut for a fake bravado operation with the given path."""
+    return types.SimpleNamespace(
+        operation=types.SimpleNamespace(path_name=path_name)
+    )
+
+
+def fake_api_client():
+    """Create a fake bravado client for the REANA Server API."""
+    return types.SimpleNamespace(
+        api=types.SimpleNamespace(
+            download_file=operation(
+                '/api/workflows/{workflow_id_or_name}/workspace/{file_name}'
+            ),
+            get_workflow_status=FakeStatusOperation(),
+            upload_file=operation(
+                '/api/workflows/{workflow_id_or_name}/workspace'
+            )
+        ),
+        swagger_spec=types.SimpleNamespace(
+            api_url='http://reana/',
+            http_client=types.SimpleNamespace(session=FakeSession())
+        )
+    )
+
+
+class LocalProxy(object):
+    """Fake werkzeug proxy that resolves attributes on every access."""
+    def __init__(self, local):
+        self._local = local
+
+    def __getattr__(self, name):
+        return getattr(self._local(), name)
+
+
+@pytest.fixture
+def reana(monkeypatch):
+    """Install fake reana-client, reana-commons and werkzeug modules. Returns
+    the fake reana-client API module. The list of created bravado clients is
+    available as the clients attribute of the module.
+    """
+    clients = list()
+
+    def get_current_api_client(component):
+        clients.append(fake_api_client())
+        return clients[-1]
+
+    api = types.ModuleType('reana_client.api.client')
+    api.current_rs_api_client = None
+    api.clients = clients
+    commons = types.ModuleType('reana_commons.api_client')
+    commons.get_current_api_client = get_current_api_client
+    local = types.ModuleType('werkzeug.local')
+    local.LocalProxy = LocalProxy
+    modules = {
+        'reana_client': types.ModuleType('reana_client'),
+        'reana_client.api': types.ModuleType('reana_client.api'),
+        'reana_client.api.client': api,
+        'reana_commons': types.ModuleType('reana_commons'),
+        'reana_commons.api_client': commons,
+        'werkzeug': types.ModuleType('werkzeug'),
+        'werkzeug.local': local
+    }
+    modules['reana_client'].api = modules['reana_client.api']
+    modules['reana_client.api'].client = api
+    modules['reana_commons'].api_client = commons
+    modules['werkzeug'].local = local
+    for name, module in modules.items():
+        monkeypatch.setitem(sys.modules, name, module)
+    monkeypatch.setattr(rn, '_api_client', (None, None))
+    monkeypatch.setattr(rn, '_api_client_lock', rn._api_client_lock)
+    monkeypatch.setattr(rn, '_pool_size', rn.DEFAULT_MAX_WORKERS)
+    return api
+
+
+def test_default_api_client(reana):
+    """Test replacing the API client proxy of the reana-client module."""
+    client = REANAClient(access_token='XXXX')
+    assert client.reana is reana
+    # The proxy resolves to the shared client that is created once.
+    api_url = reana.current_rs_api_client.swagger_spec.api_url
+    assert api_url == 'http://reana/'
+    assert client.reana.current_rs_api_client.api is not None
+    assert len(reana.clients) == 1
+    session = reana.clients[0].swagger_spec.http_client.session
+    assert set(session.adapters) == {'http://', 'https://'}
+    # The proxy is replaced only once.
+    proxy = reana.current_rs_api_client
+    assert rn.default_api_client().current_rs_api_client is proxy
+
+
+def test_connection_pool_size(reana):
+    """Test that the connection pool of the shared HTTP session is large
+    enough for the maximum number of workers of all REANA clients.
+    """
+    REANAClient(access_token='XXXX', max_workers=32)
+    session = rn.shared_api_client().swagger_spec.http_client.session
+    assert session.adapters['http://']._pool_maxsize == 32
+    # The pool is enlarged for clients that are created later.
+    REANAClient(access_token='XXXX', max_workers=64)
+    assert session.adapters['http://']._pool_maxsize == 64
+    assert session.adapters['https://']._pool_maxsize == 64
+    # The pool is not reduced for clients with fewer workers.
+    REANAClient(access_token='XXXX', max_workers=4)
+    assert session.adapters['http://']._pool_maxsize == 64
+
+
+def test_shared_api_client_fork(reana, monkeypatch):
+    """Test that a forked process creates its own shared API client."""
+    api_client = rn.shared_api_client()
+    assert rn.shared_api_client() is api_client
+    pid = os.getpid()
+    monkeypatch.setattr(os, 'getpid', lambda: pid + 1)
+    child_client = rn.shared_api_client()
+    assert child_client is not api_client
+    assert rn.shared_api_client() is child_client
+    assert len(reana.clients) == 2
+
+
+def test_shared_api_client_fork_lock(reana, monkeypatch):
+    """Test that a forked process does not wait for the lock of the shared
+    API client that was held by another thread of the parent process.
+    """
+    api_client = rn.shared_api_client()
+    lock = rn.api_client_lock()
+    pid = os.getpid()
+    with lock:
+        monkeypatch.setattr(os, 'getpid', lambda: pid + 1)
+        child_client = rn.shared_api_client()
+        assert child_client is not api_client
+        assert rn.api_client_lock() is not lock
+        assert not rn.api_client_lock().locked()
+
+
+def test_shared_api_client_threads(reana, monkeypatch):
+    """Test that concurrent threads create a single shared API client."""
+    commons = sys.modules['reana_commons.api_client']
+    create_client = commons.get_current_api_client
+
+    def get_current_api_client(component):
+        # Delay the creation of the client to give other threads the chance
+        # to access the shared client at the same time.
+        time.sleep(0.01)
+        return create_client(component)
+
+    monkeypatch.setattr(
+        commons,
+        'get_current_api_client',
+        get_current_api_client
+    )
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [executor.submit(rn.shared_api_client) for _ in range(8)]
+    assert len(reana.clients) == 1
+    assert all(f.result() is reana.clients[0] for f in futures)
+
+
+def test_stream_file(reana, monkeypatch, tmpdir):
+    """Test downloading a file over the shared HTTP session."""
+    session = rn.shared_api_client().swagger_spec.http_client.session
+    session.response = FakeResponse(200, content=b'0123456789')
+    client = REANAClient(access_token='XXXX')
+    target = os.path.join(str(tmpdir), 'results', 'A.txt')
+    client.download_file('0000', 'results/A.txt', target)
+    with open(target, 'rb') as f:
+        assert f.read() == b'0123456789'
+    method, url, kwargs = session.requests[0]
+    assert method == 'GET'
+    assert url == 'http://reana/api/workflows/0000/workspace/results/A.txt'
+    assert kwargs['params'] == {'access_token': 'XXXX'}
+    assert kwargs['stream']
+    assert session.response.closed
+    # Error responses raise an error and close the response. Client errors
+    # are not retried while server errors are.
+    monkeypatch.setattr(rn, 'RETRY_DELAY', 0)
+    session.response = FakeResponse(404)
+    target = os.path.join(str(tmpdir), 'results', 'B.txt')
+    with pytest.raises(RuntimeError):
+        client.download_file('0000', 'results/B.txt', target)
+    assert session.response.closed
+    assert len(session.requests) == 2
+    assert not os.path.exists(target)
+    session.response = FakeResponse(503)
+    with pytest.raises(rn.RequestError):
+        client.download_file('0000', 'results/B.txt', target)
+    assert len(session.requests) == 2 + rn.RETRY_ATTEMPTS
+    # A failed download does not modify an existing target file and does
+    # not leave any temporary files behind.
+    target = os.path.join(str(tmpdir), 'results', 'A.txt')
+    session.response = FakeResponse(404)
+    with pytest.raises(rn.RequestError):
+        client.download_file('0000', 'results/A.txt', target)
+    with open(target, 'rb') as f:
+        assert f.read() == b'0123456789'
+    assert os.listdir(os.path.dirname(target)) == ['A.txt']
+
+
+def test_get_workflow_status(reana, monkeypatch):
+    """Test retrying workflow status requests that are sent through the
+    shared API client.
+    """
+    monkeypatch.setattr(rn, 'RETRY_DELAY', 0)
+    status = rn.shared_api_client().api.get_workflow_status
+    client = REANAClient(access_token='XXXX')
+    # Server errors are retried.
+    status.errors = [FakeHTTPError(503)]
+    state = client.get_workflow_state('0000', StatePending())
+    assert state.is_running()
+    request = {'workflow_id_or_name': '0000', 'access_token': 'XXXX'}
+    assert status.requests == [request, request]
+    # Client errors are not retried.
+    status.errors = [FakeHTTPError(404)]
+    with pytest.raises(FakeHTTPError):
+        client.get_workflow_state('0000', StatePending())
+    assert len(status.requests) == 3
+    # Responses with an unexpected status code raise an error.
+    status.response = FakeResponse(204)
+    with pytest.raises(rn.RequestError):
+        client.get_workflow_state('0000', StatePending())
+    assert len(status.requests) == 4
+
+
+def test_post_file(reana, tmpdir):
+    """Test uploading a file over the shared HTTP session."""
+    session = rn.shared_api_client().swagger_spec.http_client.session
+    filename = os.path.join(str(tmpdir), 'A.txt')
+    with open(filename, 'wb') as f:
+        f.write(b'0123456789')
+    client = REANAClient(access_token='XXXX')
+    client.upload_file('0000', filename, 'code/A.txt')
+    method, url, kwargs = session.requests[0]
+    assert method == 'POST'
+    assert url == 'http://reana/api/workflows/0000/workspace'
+    assert kwargs['data'] == b'0123456789'
+    assert kwargs['params'] == {
+        'file_name': 'code/A.txt',
+        'access_token': 'XXXX'
+    }
+    assert kwargs['headers'] == {'Content-Type': 'application/octet-stream'}
+    # Error responses raise an error.
+    session.response = FakeResponse(500)
+    with open(filename, 'rb') as f:
+        with pytest.raises(RuntimeError):
+            rn.post_file('0000', f, 'code/A.txt', 'XXXX')
@@ -0,0 +1,320 @@
+# This file is part of the Reproducible and Reusable Data Analysis Workflow
+# Server (flowServ).
+#
+# Copyright (C) 2019-2020 NYU.
+#
+# flowServ is free software; you can redistribute it and/or modify it under the
+# terms of the MIT License; see LICENSE file for more details.
+
+"""Unit tests for file transfers and status requests of the REANA client."""
+
+import io
+import os
+import pickle
+import pytest
+import tarfile
+import types
+
+from flowserv.model.template.base import WorkflowTemplate
+from flowserv.model.workflow.state import StatePending
+from flowservreana.client import INPUT_ARCHIVE
+from flowservreana.client import REANAClient, add_extract_step, list_files
+from flowservreana.tests import REANATestAPI
+
+import flowserv.core.util as util
+
+
+class StatusAPI(REANATestAPI):
+    """Test API that returns a fixed workflow status and counts the number of
+    status requests. The given errors are raised (in order) for the first
+    status requests.
+    """
+    def __init__(self, basedir, status='running', errors=None):
+        super(StatusAPI, self).__init__(basedir=basedir)
+        self.response_status = status
+        self.errors = list(errors) if errors is not None else list()
+        self.count = 0
+
+    def get_workflow_status(self, workflow, token):
+        self.count += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return {'status': self.response_status}
+
+
+def test_upload_directory(tmpdir):
+    """Test uploading a nested directory tree to the workflow workspace."""
+    # Create a directory tree with files at different levels
+    sourcedir = os.path.join(str(tmpdir), 'source')
+    files = ['A.json', 'a/B.json', 'a/b/C.json', 'a/b/D.json']
+    for filename in files:
+        filepath = os.path.join(sourcedir, filename)
+        util.create_dir(os.path.dirname(filepath))
+        util.write_object(obj={'name': filename}, filename=filepath)
+    basedir = os.path.join(str(tmpdir), 'reana')
+    api = REANATestAPI(basedir=basedir)
+    client = REANAClient(reana_client=api, access_token='XXXX')
+    workflow_id = api.create_workflow(dict(), 'test', 'XXXX')['workflow_id']
+    client.upload_file(workflow_id, sourcedir, 'code')
+    workflowdir = os.path.join(basedir, workflow_id, 'code')
+    for filename in files:
+        doc = util.read_object(filename=os.path.join(workflowdir, filename))
+        assert doc == {'name': filename}
+    # Symbolic links to directories are followed. Cycles raise an error.
+    os.symlink(os.path.join(sourcedir, 'a', 'b'), os.path.join(sourcedir, 'c'))
+    client.upload_file(workflow_id, sourcedir, 'code')
+    filename = os.path.join(workflowdir, 'c', 'C.json')
+    assert util.read_object(filename=filename) == {'name': 'a/b/C.json'}
+    os.symlink(sourcedir, os.path.join(sourcedir, 'a', 'loop'))
+    with pytest.raises(ValueError):
+        client.upload_file(workflow_id, sourcedir, 'code')
+
+
+def test_upload_duplicate_files(tmpdir):
+    """Test uploading the same input file for multiple workflows."""
+    filename = os.path.join(str(tmpdir), 'A.json')
+    util.write_object(obj={'a': 1}, filename=filename)
+    basedir = os.path.join(str(tmpdir), 'reana')
+    api = REANATestAPI(basedir=basedir)
+    client = REANAClient(reana_client=api, access_token='XXXX')
+    targets = list()
+    for i in range(2):
+        wf_id = api.create_workflow(dict(), 'test', 'XXXX')['workflow_id']
+        client.upload_file(wf_id, filename, 'A.json')
+        targets.append(os.path.join(basedir, wf_id, 'A.json'))
+    for target in targets:
+        assert util.read_object(filename=target) == {'a': 1}
+    assert os.stat(targets[0]).st_ino == os.stat(targets[1]).st_ino
+    # Uploading a modified file replaces the linked copy.
+    util.write_object(obj={'a': 10}, filename=filename)
+    client.upload_file(wf_id, filename, 'A.json')
+    assert util.read_object(filename=targets[0]) == {'a': 1}
+    assert util.read_object(filename=targets[1]) == {'a': 10}
+    # Files are identified by their content. A modified file with the same
+    # size and modification time is not linked to the previous copy.
+    stat = os.stat(filename)
+    util.write_object(obj={'a': 20}, filename=filename)
+    os.utime(filename, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    client.upload_file(wf_id, filename, 'A.json')
+    assert util.read_object(filename=targets[1]) == {'a': 20}
+    # Different files with the same content are linked.
+    copy = os.path.join(str(tmpdir), 'B.json')
+    util.write_object(obj={'a': 1}, filename=copy)
+    client.upload_file(wf_id, copy, 'B.json')
+    target = os.path.join(basedir, wf_id, 'B.json')
+    assert os.stat(target).st_ino == os.stat(targets[0]).st_ino
+
+
+def test_upload_overwritten_target(tmpdir):
+    """Test uploading a file with the content of a previously uploaded file
+    whose target was overwritten in the meantime.
+    """
+    basedir = os.path.join(str(tmpdir), 'reana')
+    api = REANATestAPI(basedir=basedir)
+    wf_1 = api.create_workflow(dict(), 'test', 'XXXX')['workflow_id']
+    wf_2 = api.create_workflow(dict(), 'test', 'XXXX')['workflow_id']
+    for workflow_id, content in [(wf_1, b'XXXX'), (wf_1, b'YYYY')]:
+        api.upload_file(workflow_id, io.BytesIO(content), 'A', 'XXXX')
+    api.upload_file(wf_2, io.BytesIO(b'XXXX'), 'A', 'XXXX')
+    for workflow_id, content in [(wf_1, b'YYYY'), (wf_2, b'XXXX')]:
+        with open(os.path.join(basedir, workflow_id, 'A'), 'rb') as f:
+            assert f.read() == content
+
+
+def test_upload_errors(tmpdir):
+    """Test that errors for individual file uploads are raised after all files
+    in a directory have been processed.
+    """
+    sourcedir = os.path.join(str(tmpdir), 'source')
+    util.create_dir(sourcedir)
+    util.write_object(obj={}, filename=os.path.join(sourcedir, 'A.json'))
+
+    class ErrorAPI(REANATestAPI):
+        def upload_file(self, workflow_id, file, filename, token):
+            raise ValueError('no space')
+
+    client = REANAClient(
+        reana_client=ErrorAPI(basedir=str(tmpdir)),
+        access_token='XXXX'
+    )
+    with pytest.raises(RuntimeError):
+        client.upload_file('0000', sourcedir, 'code')
+
+
+def test_upload_broken_link(tmpdir):
+    """Test that uploading a directory with a broken symbolic link raises an
+    error instead of skipping the link.
+    """
+    sourcedir = os.path.join(str(tmpdir), 'source')
+    util.create_dir(sourcedir)
+    util.write_object(obj={}, filename=os.path.join(sourcedir, 'A.json'))
+    missing = os.path.join(str(tmpdir), 'missing.json')
+    os.symlink(missing, os.path.join(sourcedir, 'B.json'))
+    assert sorted(target for _, target in list_files(sourcedir, 'code')) == [
+        'code/A.json',
+        'code/B.json'
+    ]
+    basedir = os.path.join(str(tmpdir), 'reana')
+    api = REANATestAPI(basedir=basedir)
+    client = REANAClient(reana_client=api, access_token='XXXX')
+    workflow_id = api.create_workflow(dict(), 'test', 'XXXX')['workflow_id']
+    with pytest.raises(RuntimeError):
+        client.upload_file(workflow_id, sourcedir, 'code')
+
+
+def test_download_file(tmpdir):
+    """Test downloading a result file into a new local directory."""
+    basedir = os.path.join(str(tmpdir), 'reana')
+    api = REANATestAPI(basedir=basedir)
+    client = REANAClient(reana_client=api, access_token='XXXX')
+    workflow_id = api.create_workflow(dict(), 'test', 'XXXX')['workflow_id']
+    filename = os.path.join(basedir, workflow_id, 'results', 'out.json')
+    util.create_dir(os.path.dirname(filename))
+    util.write_object(obj={'a': 1}, filename=filename)
+    target = os.path.join(str(tmpdir), 'run', 'results', 'out.json')
+    client.download_file(workflow_id, 'results/out.json', target)
+    assert util.read_object(filename=target) == {'a': 1}
+
+
+def test_workflow_status_cache(tmpdir):
+    """Test reusing status responses for repeated workflow status requests."""
+    api = StatusAPI(basedir=str(tmpdir), status='queued')
+    client = REANAClient(reana_client=api, access_token='XXXX', status_ttl=60)
+    for i in range(3):
+        state = client.get_workflow_state('0000', StatePending())
+        assert state.is_pending()
+    assert api.count == 1
+    # Responses are not cached by default.
+    client = REANAClient(reana_client=api, access_token='XXXX')
+    for i in range(2):
+        client.get_workflow_state('0000', StatePending())
+    assert api.count == 3
+    # Status requests for multiple workflows.
+    states = client.get_workflow_states({'0001': StatePending()})
+    assert states['0001'].is_pending()
+    assert api.count == 4
+
+
+def test_upload_archive():
+    """Test adding the archive extraction step to a workflow specification."""
+    spec = {
+        'workflow': {
+            'type': 'serial',
+            'specification': {
+                'steps': [{'environment': 'ENV', 'commands': ['run']}]
+            }
+        }
+    }
+    archive_spec = add_extract_step(spec, 'inputs.tar.gz')
+    steps = archive_spec['workflow']['specification']['steps']
+    assert len(steps) == 2
+    assert steps[0]['environment'] == 'ENV'
+    cmd = 'tar -xzf inputs.tar.gz && rm inputs.tar.gz'
+    assert steps[0]['commands'] == [cmd]
+    # The original specification is not modified.
+    assert len(spec['workflow']['specification']['steps']) == 1
+    # The environment of the extraction step can be given explicitly.
+    archive_spec = add_extract_step(spec, 'inputs.tar.gz', environment='TAR')
+    steps = archive_spec['workflow']['specification']['steps']
+    assert steps[0]['environment'] == 'TAR'
+    assert steps[1]['environment'] == 'ENV'
+    assert add_extract_step({'workflow': {}}, 'inputs.tar.gz') is None
+
+
+def test_create_workflow_with_archive(tmpdir):
+    """Test uploading the input files of a new workflow as an archive."""
+
+    class ArchiveAPI(REANATestAPI):
+        def create_workflow(self, workflow_spec, name, token):
+            self.workflow_spec = workflow_spec
+            return super(ArchiveAPI, self).create_workflow(
+                workflow_spec=workflow_spec,
+                name=name,
+                token=token
+            )
+
+    # Create a template directory with two input files. One of the files is
+    # a symbolic link to a file outside the template directory.
+    sourcedir = os.path.join(str(tmpdir), 'template')
+    util.create_dir(os.path.join(sourcedir, 'code'))
+    util.write_object(
+        obj={'name': 'A'},
+        filename=os.path.join(sourcedir, 'code', 'A.json')
+    )
+    linked_file = os.path.join(str(tmpdir), 'B.json')
+    util.write_object(obj={'name': 'B'}, filename=linked_file)
+    os.symlink(linked_file, os.path.join(sourcedir, 'code', 'B.json'))
+    template = WorkflowTemplate(
+        workflow_spec={
+            'inputs': {'files': ['code']},
+            'workflow': {
+                'type': 'serial',
+                'specification': {
+                    'steps': [{'environment': 'ENV', 'commands': ['run']}]
+                }
+            }
+        },
+        sourcedir=sourcedir
+    )
+    basedir = os.path.join(str(tmpdir), 'reana')
+    api = ArchiveAPI(basedir=basedir)
+    client = REANAClient(
+        reana_client=api,
+        access_token='XXXX',
+        upload_archive=True,
+        archive_environment='TAR'
+    )
+    run = types.SimpleNamespace(state=StatePending())
+    wf = client.create_workflow(run=run, template=template, arguments=dict())
+    # The submitted specification starts with the archive extraction step.
+    steps = api.workflow_spec['workflow']['specification']['steps']
+    assert len(steps) == 2
+    cmd = 'tar -xzf {0} && rm {0}'.format(INPUT_ARCHIVE)
+    assert steps[0]['commands'] == [cmd]
+    assert steps[0]['environment'] == 'TAR'
+    assert steps[1]['commands'] == ['run']
+    # The archive contains the content of the linked file.
+    archive = os.path.join(basedir, wf.identifier, INPUT_ARCHIVE)
+    with tarfile.open(archive, 'r:gz') as tar:
+        members = {m.name: m for m in tar.getmembers()}
+        assert set(members) == {'code/A.json', 'code/B.json'}
+        assert members['code/B.json'].isfile()
+        content = tar.extractfile('code/B.json').read()
+    with open(linked_file, 'rb') as f:
+        assert content == f.read()
+
+
+def test_retry_status_request(tmpdir):
+    """Test retrying a failed workflow status request."""
+    api = StatusAPI(
+        basedir=str(tmpdir),
+        errors=[ConnectionError('connection reset')]
+    )
+    client = REANAClient(reana_client=api, access_token='XXXX')
+    state = client.get_workflow_state('0000', StatePending())
+    assert state.is_running()
+    assert api.count == 2
+    # Permanent errors are not retried.
+    api = StatusAPI(basedir=str(tmpdir), errors=[ValueError('unknown')])
+    client = REANAClient(reana_client=api, access_token='XXXX')
+    with pytest.raises(ValueError):
+        client.get_workflow_state('0000', StatePending())
+    assert api.count == 1
+
+
+def test_inactive_workflow_state(tmpdir):
+    """Test that no status request is issued for inactive workflows."""
+    api = StatusAPI(basedir=str(tmpdir))
+    client = REANAClient(reana_client=api, access_token='XXXX')
+    state = StatePending().error(messages=['failed'])
+    assert client.get_workflow_state('0000', state) == state
+    assert api.count == 0
+
+
+def test_pickle_default_client():
+    """Test that a client for the default REANA API can be pickled without
+    importing the reana-client.
+    """
+    client = pickle.loads(pickle.dumps(REANAClient(access_token='XXXX')))
+    assert client.token == 'XXXX'
+    assert client.shared_session
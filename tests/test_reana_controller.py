@@ -0,0 +1,98 @@
+# This file is part of the Reproducible and Reusable Data Analysis Workflow
+# Server (flowServ).
+#
+# Copyright (C) 2019-2020 NYU.
+#
+# flowServ is free software; you can redistribute it and/or modify it under the
+# terms of the MIT License; see LICENSE file for more details.
+
+"""Unit tests for modifying templates with the REANA workflow controller."""
+
+import pytest
+
+from flowserv.model.parameter.base import TemplateParameter
+from flowserv.model.template.base import WorkflowTemplate
+from flowservreana.client import REANAClient
+from flowservreana.controller import REANAWorkflowController, configure
+from flowservreana.tests import REANATestAPI
+
+import flowserv.core.error as err
+import flowserv.model.parameter.declaration as pd
+
+
+def PARA(identifier, data_type=pd.DT_STRING, name=None):
+    """Shortcut to create a template parameter."""
+    obj = pd.parameter_declaration(
+        identifier=identifier,
+        name=name,
+        data_type=data_type
+    )
+    return TemplateParameter(obj)
+
+
+def test_modify_template(tmpdir):
+    """Test adding parameters to a serial workflow template."""
+    controller = REANAWorkflowController(
+        client=REANAClient(
+            reana_client=REANATestAPI(basedir=str(tmpdir)),
+            access_token='XXXX'
+        )
+    )
+    spec = {
+        'inputs': {
+            'files': ['code/helloworld.py'],
+            'parameters': {'names': '$[[names]]'}
+        },
+        'workflow': {'type': 'serial'}
+    }
+    template = WorkflowTemplate(
+        workflow_spec=spec,
+        sourcedir=str(tmpdir),
+        parameters=[PARA('names', data_type=pd.DT_FILE), PARA('sleeptime')]
+    )
+    parameters = {
+        'sleeptime': PARA('sleeptime', name='Sleep'),
+        'greeting': PARA('greeting'),
+        'data': PARA('data', data_type=pd.DT_FILE)
+    }
+    template = controller.modify_template(template, parameters)
+    para_ids = {'names', 'sleeptime', 'greeting', 'data'}
+    assert set(template.parameters) == para_ids
+    assert template.parameters['sleeptime'].name == 'Sleep'
+    inputs = template.workflow_spec['inputs']
+    assert inputs['files'] == ['code/helloworld.py', '$[[data]]']
+    assert inputs['parameters'] == {
+        'names': '$[[names]]',
+        'sleeptime': '$[[sleeptime]]',
+        'greeting': '$[[greeting]]'
+    }
+    assert template.workflow_spec['workflow'] == {'type': 'serial'}
+    # The original workflow specification is not modified.
+    assert spec['inputs']['files'] == ['code/helloworld.py']
+    assert spec['inputs']['parameters'] == {'names': '$[[names]]'}
+    # Error for non-serial workflows.
+    template = WorkflowTemplate(
+        workflow_spec={'workflow': {'type': 'yadage'}},
+        sourcedir=str(tmpdir)
+    )
+    with pytest.raises(err.InvalidTemplateError):
+        controller.modify_template(template, parameters)
+
+
+def test_configure_defaults(tmpdir):
+    """Test process-wide default arguments for workflow controllers."""
+    client = REANAClient(
+        reana_client=REANATestAPI(basedir=str(tmpdir)),
+        access_token='XXXX'
+    )
+    configure(client=client, is_async=False)
+    try:
+        controller = REANAWorkflowController()
+        assert controller.client == client
+        assert not controller.is_async
+        controller = REANAWorkflowController(is_async=True)
+        assert controller.is_async
+    finally:
+        configure(client=None, is_async=None)
+    with pytest.raises(ValueError):
+        configure(token='XXXX')
@@ -11,6 +11,9 @@
 import os
 import time
 
+from flowserv.core.files import FileHandle, InputFile
+from flowserv.model.parameter.value import TemplateArgument
+from flowserv.model.template.base import WorkflowTemplate
 from flowserv.service.api import API
 from flowserv.tests.files import FakeStream
 from flowservreana.client import REANAClient
@@ -18,6 +21,7 @@ from flowservreana.controller import REANAWorkflowController
 from flowservreana.tests import REANATestAPI
 
 import flowserv.config.api as config
+import flowserv.controller.remote.engine as remote
 import flowserv.core.util as util
 import flowserv.model.workflow.state as st
 import flowserv.tests.db as db
@@ -31,13 +35,49 @@ TEMPLATE_DIR = os.path.join(DIR, './.files')
 # Default users
 UID = '0000'
 
+# Maximum number of polls while waiting for a workflow run to finish.
+MAX_ATTEMPTS = 50
 
-def test_run_reana_workflow(tmpdir):
+
+def poll_intervals(initial=0.05, factor=2, maximum=1.0):
+    """Generator for the intervals (in seconds) between consecutive polls of
+    the state of a workflow run. The interval grows exponentially up to the
+    given maximum. Stops after MAX_ATTEMPTS intervals.
+    """
+    interval = initial
+    for _ in range(MAX_ATTEMPTS):
+        yield interval
+        interval = min(interval * factor, maximum)
+
+
+class RecordingAPI(REANATestAPI):
+    """Test API that records the order of workflow creation and status
+    requests.
+    """
+    def __init__(self, basedir):
+        super(RecordingAPI, self).__init__(basedir=basedir)
+        self.requests = list()
+
+    def create_workflow(self, workflow_spec, name, token):
+        self.requests.append('create')
+        return super(RecordingAPI, self).create_workflow(
+            workflow_spec,
+            name,
+            token
+        )
+
+    def get_workflow_status(self, workflow, token):
+        self.requests.append('status')
+        return super(RecordingAPI, self).get_workflow_status(workflow, token)
+
+
+def test_run_reana_workflow(monkeypatch, tmpdir):
     """Execute the fake workflow example."""
     # -- Setup ----------------------------------------------------------------
     # Create the database and service API with a serial workflow engine in
     # asynchronous mode
     os.environ[config.FLOWSERV_API_BASEDIR] = os.path.abspath(str(tmpdir))
+    monkeypatch.setenv(remote.REMOTE_ENGINE_POLL, '0.1')
     api = API(
         con=db.init_db(str(tmpdir), users=[UID]).connect(),
         engine=REANAWorkflowController(
@@ -68,9 +108,12 @@ def test_run_reana_workflow(tmpdir):
         user_id=UID
     )
     r_id = run['id']
-    # Poll workflow state every second.
-    while run['state'] in st.ACTIVE_STATES:
-        time.sleep(1)
+    # Poll workflow state with increasing intervals. The state is still
+    # active if the run did not finish within the maximum number of polls.
+    for interval in poll_intervals():
+        if run['state'] not in st.ACTIVE_STATES:
+            break
+        time.sleep(interval)
         run = api.runs().get_run(run_id=r_id, user_id=UID)
     assert run['state'] == st.STATE_SUCCESS
     resources = dict()
@@ -96,9 +139,83 @@ def test_run_reana_workflow(tmpdir):
         user_id=UID
     )
     r_id = run['id']
-    # Poll workflow state every second.
-    while run['state'] in st.ACTIVE_STATES:
-        time.sleep(1)
+    # Poll workflow state with increasing intervals. The state is still
+    # active if the run did not finish within the maximum number of polls.
+    for interval in poll_intervals():
+        if run['state'] not in st.ACTIVE_STATES:
+            break
+        time.sleep(interval)
         run = api.runs().get_run(run_id=r_id, user_id=UID)
     assert run['state'] == st.STATE_ERROR
     assert run['messages'] == ['unknown reason']
+
+
+def test_exec_reana_workflows(monkeypatch, tmpdir):
+    """Execute multiple runs of the fake workflow example concurrently."""
+    # -- Setup ----------------------------------------------------------------
+    basedir = os.path.abspath(str(tmpdir))
+    monkeypatch.setenv(config.FLOWSERV_API_BASEDIR, basedir)
+    monkeypatch.setenv(remote.REMOTE_ENGINE_POLL, '0.01')
+    reana = RecordingAPI(basedir=str(tmpdir))
+    controller = REANAWorkflowController(
+        client=REANAClient(reana_client=reana, access_token='XXXX')
+    )
+    api = API(
+        con=db.init_db(str(tmpdir), users=[UID]).connect(),
+        engine=controller
+    )
+    wh = api.workflows().create_workflow(name='W1', sourcedir=TEMPLATE_DIR)
+    w_id = wh['id']
+    gh = api.groups().create_group(workflow_id=w_id, name='G', user_id=UID)
+    g_id = gh['id']
+    filename = os.path.join(TEMPLATE_DIR, 'template.yaml')
+    template = WorkflowTemplate.from_dict(
+        doc=util.read_object(filename=filename),
+        sourcedir=TEMPLATE_DIR
+    )
+    # -- Execute runs ---------------------------------------------------------
+    actions = ['SUCCESS', 'ERROR', 'SUCCESS', 'ERROR']
+    runs = list()
+    for i, action in enumerate(actions):
+        filename = os.path.join(str(tmpdir), 'inputs', '{}.json'.format(i))
+        util.create_dir(os.path.dirname(filename))
+        util.write_object(obj={'action': action}, filename=filename)
+        arguments = {
+            'todo': TemplateArgument(
+                parameter=template.get_parameter('todo'),
+                value=InputFile(
+                    f_handle=FileHandle(filename=filename),
+                    target_path='inputs/to-do.json'
+                )
+            )
+        }
+        run = api.run_manager.create_run(
+            workflow_id=w_id,
+            group_id=g_id,
+            arguments=arguments
+        )
+        runs.append((run, template, arguments))
+    states = controller.exec_workflows(runs)
+    expected = [
+        st.STATE_SUCCESS,
+        st.STATE_ERROR,
+        st.STATE_SUCCESS,
+        st.STATE_ERROR
+    ]
+    assert [s.type_id for s in states] == expected
+    # All workflows are submitted before any of them is monitored.
+    assert reana.requests[:len(runs)] == ['create'] * len(runs)
+    assert reana.requests.count('create') == len(runs)
+    for state in states:
+        if state.is_success():
+            resources = list(state.resources)
+            assert len(resources) == 1
+            doc = util.read_object(filename=resources[0].filename)
+            assert doc == {'action': 'SUCCESS'}
+    # The final states are stored in the database by the caller.
+    for (run, _, _), state in zip(runs, states):
+        api.runs().update_run(run_id=run.identifier, state=state)
+    for (run, _, _), state_id in zip(runs, expected):
+        doc = api.runs().get_run(run_id=run.identifier, user_id=UID)
+        assert doc['state'] == state_id
+    assert controller.exec_workflows([]) == []